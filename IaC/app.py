@@ -45,7 +45,7 @@ app = cdk.App()
 vpc_stack = CdkVpcStack(app, f"vpc-{ACCOUNT_NUMBER}", env=environment)
 ecs_stack = CdkEcsStack(app, f"ecs-{ACCOUNT_NUMBER}", vpc_stack, env=environment)
 database_stack = CdkDataStack(app, f"databases-{ACCOUNT_NUMBER}", env=environment)
-authentication_stack = AuthenticationStack(app, f"authentication-{ACCOUNT_NUMBER}", vpc_stack, env=environment)
+authentication_stack = AuthenticationStack(app, f"authentication-{ACCOUNT_NUMBER}", env=environment)
 rtc_stack = RealtimeCommunicationStack(app, f"realtime-communication-{ACCOUNT_NUMBER}", vpc_stack, env=environment)
 
 # Define dependencies
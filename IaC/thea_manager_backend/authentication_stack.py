@@ -1,13 +1,13 @@
 #!/usr/bin/env python
 
-#TODO: Configure CORS to be more secure and limiting only to the domain you care about
-
 # ---------------------------------------------------------------
 #                           Imports
 # ---------------------------------------------------------------
 
 # Native imports
 from os import path, getenv
+from typing import NamedTuple
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # CDK imports
@@ -36,15 +36,16 @@ from aws_cdk.aws_apigateway import (
     CorsOptions,
     EndpointType,
     StageOptions,
+    MethodResponse,
     JsonSchemaType,
+    RequestValidator,
     LambdaIntegration,
     MethodLoggingLevel,
+    IntegrationResponse,
     EndpointConfiguration
 )
 
 import aws_cdk.aws_lambda as lmb
-import aws_cdk.aws_codedeploy as codedeploy
-import aws_cdk.aws_cloudwatch as cloudwatch
 
 # ---------------------------------------------------------------
 #                             Globals
@@ -53,10 +54,168 @@ import aws_cdk.aws_cloudwatch as cloudwatch
 # Current directoy
 current_directory = path.dirname(__file__)
 
-# Env vars
-load_dotenv(path.join(current_directory, "../.env"))
-
-STAGE=getenv("STAGE")
+# Env vars, loaded on first stack construction rather than at import
+@lru_cache(maxsize=None)
+def get_stage() -> str:
+    load_dotenv(path.join(current_directory, "../.env"))
+    return getenv("STAGE")
+
+# User pool custom attributes
+CUSTOM_ATTRIBUTES = {
+    "orgId":StringAttribute(mutable=False),
+    "userType":StringAttribute(mutable=False),
+    "username":StringAttribute(mutable=True),
+    "profilePicture":StringAttribute(mutable=True)
+}
+
+# Shared value for every optional standard attribute of the user pool
+OPTIONAL_ATTRIBUTE = StandardAttribute(required=False)
+
+# Shared leaf schema for every string property in the request models
+STRING_SCHEMA = JsonSchema(type=JsonSchemaType.STRING)
+
+# Request body properties, interned per field set
+@lru_cache(maxsize=None)
+def request_properties(fields: tuple, nested: tuple = ()) -> dict:
+    """
+    Maps each field to the shared string schema and each (field, sub_fields)
+    pair in nested to an object schema built the same way. Routes with the
+    same field set get the same properties dict back.
+    """
+    properties = {field: STRING_SCHEMA for field in fields}
+
+    for field, sub_fields in nested:
+        properties[field] = JsonSchema(
+            type=JsonSchemaType.OBJECT,
+            properties=request_properties(sub_fields)
+        )
+
+    return properties
+
+# Order independent key of a request body, nested objects included
+def request_shape(fields: tuple, nested: tuple = ()) -> frozenset:
+    return frozenset(fields) | frozenset(
+        (field, request_shape(sub_fields)) for field, sub_fields in nested
+    )
+
+# Failure alarm metric, API gateway 5XX errors for this api
+ALARM_METRIC_NAME = "5XXError"
+ALARM_DIMENSIONS = {"ApiName":"authentication"}
+ALARM_PERIOD = cdk.Duration.minutes(1)
+
+# Response mappings shared by every non-proxy lambda integration
+INTEGRATION_RESPONSES = [IntegrationResponse(status_code="200")]
+METHOD_RESPONSES = [MethodResponse(status_code="200")]
+
+# Non-proxy lambda integration, same options on every route
+def lambda_integration(handler: lmb.IFunction) -> LambdaIntegration:
+    return LambdaIntegration(
+        handler=handler,
+        allow_test_invoke=True,
+        proxy=False,
+        integration_responses=INTEGRATION_RESPONSES
+    )
+
+# Handler runtime, declared directly since the pinned CDK predates the python3.12 & arm64 enums
+HANDLER_RUNTIME = lmb.Runtime("python3.12", lmb.RuntimeFamily.PYTHON)
+HANDLER_ARCHITECTURES = ["arm64"]
+
+# Architectures is set through an override, classified as a version property so current_version accepts it
+lmb.Function.classify_version_property("Architectures", True)
+
+# Handler timeout, well inside API gateway's 29 second integration limit
+HANDLER_TIMEOUT = cdk.Duration.seconds(10)
+
+# Handler sources, one folder per route
+LAMBDAS_DIR = path.join(current_directory, "../../src/backend/lambdas/serverless-authentication")
+
+# Local build leftovers kept out of the handler assets
+ASSET_EXCLUDE = ["__pycache__", "*.pyc", "tests"]
+
+# Handler memory, more memory also buys proportionally more CPU
+HANDLER_MEMORY = 256
+WARM_HANDLER_MEMORY = 1024
+
+# Routes on the signin path, given more memory & kept warm with provisioned concurrency in prod
+WARM_ROUTES = frozenset({"signup", "signin", "confirm-signin"})
+PROVISIONED_CONCURRENCY = 2
+
+# Fields every app client request carries, shared by most route bodies
+CLIENT_FIELDS = ("username", "clientId", "clientSecret")
+
+# Authentication route descriptor, body given as (string fields, nested object fields)
+class AuthenticationRoute(NamedTuple):
+    path: str
+    description: str
+    actions: tuple
+    fields: tuple
+    nested: tuple = ()
+
+# Authentication routes, each backed by its own lambda handler & alias
+AUTHENTICATION_ROUTES = (
+    AuthenticationRoute(
+        path="signup",
+        description="Cognito user signs up to user pool",
+        actions=("cognito-idp:SignUp",),
+        fields=(*CLIENT_FIELDS, "password"),
+        nested=(("userAttributes", ("name", "preferred_username", "custom:type", "custom:organization")),)
+    ),
+    AuthenticationRoute(
+        path="confirm-signup",
+        description="Cognito user confirms signup to user pool",
+        actions=("cognito-idp:ConfirmSignUp", "dynamodb:PutItem"),
+        fields=(*CLIENT_FIELDS, "confirmationCode"),
+        nested=(("userAttributes", ("email", "name", "username", "custom:role", "custom:organization")),)
+    ),
+    AuthenticationRoute(
+        path="signin",
+        description="Cognito user signs in to user pool",
+        actions=("cognito-idp:InitiateAuth",),
+        fields=(*CLIENT_FIELDS, "password", "authFlow")
+    ),
+    AuthenticationRoute(
+        path="confirm-signin",
+        description="Cognito user answers the signin MFA challenge",
+        actions=("dynamodb:PutItem", "cognito-idp:RespondToAuthChallenge"),
+        fields=(*CLIENT_FIELDS, "mfaCode", "sessionToken", "challengeName")
+    ),
+    AuthenticationRoute(
+        path="setup-totp",
+        description="Cognito user associates a TOTP software token",
+        actions=("cognito-idp:AssociateSoftwareToken",),
+        fields=("mfaCode", "secretCode", "sessionToken")
+    ),
+    AuthenticationRoute(
+        path="get-user-details",
+        description="Fetches the signed in user's details",
+        actions=("dynamodb:GetItem",),
+        fields=("accessToken",)
+    ),
+    AuthenticationRoute(
+        path="change-password",
+        description="Cognito user changes password",
+        actions=("cognito-idp:ChangePassword",),
+        fields=("oldPassword", "newPassword", "accessToken")
+    ),
+    AuthenticationRoute(
+        path="forgot-password",
+        description="Cognito user requests a password reset code",
+        actions=("cognito-idp:ForgotPassword",),
+        fields=CLIENT_FIELDS
+    ),
+    AuthenticationRoute(
+        path="confirm-forgot-password",
+        description="Cognito user resets password with the reset code",
+        actions=("cognito-idp:ConfirmForgotPassword",),
+        fields=(*CLIENT_FIELDS, "newPassword", "confirmationCode")
+    ),
+    AuthenticationRoute(
+        path="resend-confirmation-code",
+        description="Cognito user requests a new signup confirmation code",
+        actions=("cognito-idp:ResendConfirmationCode",),
+        fields=CLIENT_FIELDS
+    )
+)
 
 # ---------------------------------------------------------------
 #                    Serverless Authentication
@@ -64,8 +223,12 @@ STAGE=getenv("STAGE")
 
 class AuthenticationStack(cdk.Stack):
 
-    def __init__(self, scope: cdk.Construct, construct_id: str, vpc_stack, **kwargs) -> None:
-        super().__init__(scope, construct_id, **kwargs)        
+    def __init__(self, scope: cdk.Construct, construct_id: str, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        # Deployment stage
+        stage = get_stage()
+        is_prod = stage == "prod"
 
         ######################################
         #  Config cognito pool & app client  #
@@ -74,26 +237,13 @@ class AuthenticationStack(cdk.Stack):
         self.cognito_user_pool = UserPool(
             scope=self, 
             id="user-pool",
-            user_pool_name=f"{STAGE}-user-pool",
+            user_pool_name=f"{stage}-user-pool",
             account_recovery=AccountRecovery.EMAIL_ONLY,
             auto_verify=AutoVerifiedAttrs(
                 email=True,
                 phone=False
             ),
-            custom_attributes={
-                "orgId":StringAttribute(
-                    mutable=False
-                ),
-                "userType":StringAttribute(
-                    mutable=False
-                ),
-                "username":StringAttribute(
-                    mutable=True
-                ),
-                "profilePicture":StringAttribute(
-                    mutable=True
-                )
-            },
+            custom_attributes=CUSTOM_ATTRIBUTES,
             enable_sms_role=False,
             mfa=Mfa.REQUIRED,
             mfa_second_factor=MfaSecondFactor(
@@ -112,29 +262,29 @@ class AuthenticationStack(cdk.Stack):
             sign_in_case_sensitive=False,
             self_sign_up_enabled=True,
             standard_attributes=StandardAttributes(
-                address=StandardAttribute(required=False),
-                birthdate=StandardAttribute(required=False),
+                address=OPTIONAL_ATTRIBUTE,
+                birthdate=OPTIONAL_ATTRIBUTE,
                 email=StandardAttribute(
                     mutable=False,
                     required=True
                 ),
-                family_name=StandardAttribute(required=False),
+                family_name=OPTIONAL_ATTRIBUTE,
                 fullname=StandardAttribute(
                     mutable=False,
                     required=True
                 ),
-                gender=StandardAttribute(required=False),
-                given_name=StandardAttribute(required=False),
-                last_update_time=StandardAttribute(required=False),
-                locale=StandardAttribute(required=False),
-                middle_name=StandardAttribute(required=False),
-                nickname=StandardAttribute(required=False),
-                phone_number=StandardAttribute(required=False),
-                preferred_username=StandardAttribute(required=False),
-                profile_page=StandardAttribute(required=False),
-                profile_picture=StandardAttribute(required=False),
-                timezone=StandardAttribute(required=False),
-                website=StandardAttribute(required=False)
+                gender=OPTIONAL_ATTRIBUTE,
+                given_name=OPTIONAL_ATTRIBUTE,
+                last_update_time=OPTIONAL_ATTRIBUTE,
+                locale=OPTIONAL_ATTRIBUTE,
+                middle_name=OPTIONAL_ATTRIBUTE,
+                nickname=OPTIONAL_ATTRIBUTE,
+                phone_number=OPTIONAL_ATTRIBUTE,
+                preferred_username=OPTIONAL_ATTRIBUTE,
+                profile_page=OPTIONAL_ATTRIBUTE,
+                profile_picture=OPTIONAL_ATTRIBUTE,
+                timezone=OPTIONAL_ATTRIBUTE,
+                website=OPTIONAL_ATTRIBUTE
             ),
             user_verification={
                 "email_subject": "Verify your email",
@@ -150,547 +300,78 @@ class AuthenticationStack(cdk.Stack):
             id_token_validity=cdk.Duration.days(1),
             prevent_user_existence_errors=False,
             refresh_token_validity=cdk.Duration.days(1),
-            user_pool_client_name=f"{STAGE}-app-client")
+            user_pool_client_name=f"{stage}-app-client")
 
         ######################################
         #      Create & lambda handlers      #
         ######################################
 
-        # Signup handler & alias
-        self.signup_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-signup-handler",
-            function_name=f"{STAGE}-signup-handler",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            description="Cognito user signs up to user pool",
-            role=Role(
-                scope=self,
-                id="signup-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/signup"))
-        )
-
-        self.signup_alias = lmb.Alias(
-            scope=self,
-            version=self.signup_handler.current_version,
-            id=f"{STAGE}-signup-alias",
-            alias_name="signup-alias",
-        )
-        
-        self.signup_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:SignUp",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.signup_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:SignUp"
-                ]
-            )
-        )
-
-
-        # Confirm signup & alias
-        self.confirm_signup_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-confirm-signup-handler",
-            function_name=f"{STAGE}-confirm-signup-handler",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            description="Cognito user confirms signup to user pool",
-            role=Role(
-                scope=self,
-                id="confirm-signup-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/confirm-signup"))
-        )
-
-        self.confirm_signup_alias = lmb.Alias(
-            scope=self,
-            version=self.confirm_signup_handler.current_version,
-            id=f"{STAGE}-confirm-signup-alias",
-            alias_name="confirm-signup-alias",
-        )
-
-        self.confirm_signup_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:ConfirmSignUp",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.confirm_signup_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:ConfirmSignUp"
-                ]
-            )
-        )
-
-
-        # Signin & alias
-        self.signin_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-signin-handler",
-            function_name=f"{STAGE}-signin-handler",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="signin-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/signin"))
-        )
-
-        self.signin_alias = lmb.Alias(
-            scope=self,
-            version=self.signin_handler.current_version,
-            id=f"{STAGE}-signin-alias",
-            alias_name="signin-alias",
-        )
-
-        self.signin_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:InitiateAuth",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.signin_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:InitiateAuth"
-                ]
-            )
-        )
-
-        # Confirm signin & alias
-        self.confirm_signin_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-confirm-signin-handler",
-            function_name=f"{STAGE}-confirm-signin-handler",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="confirm-signin-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/confirm-signin"))
-        )
-
-        self.confirm_signin_alias = lmb.Alias(
-            scope=self,
-            version=self.confirm_signin_handler.current_version,
-            id=f"{STAGE}-confirm-signin-alias",
-            alias_name="confirm-signin-alias",
-        )
-
-        self.confirm_signin_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "dynamodb:PutItem",
-                    "cognito:RespondToAuthChallenge",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.confirm_signin_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "dynamodb:PutItem",
-                    "cognito:RespondToAuthChallenge"
-                ]
-            )
-        )
-
-        # Setup TOTP & alias
-        self.setup_totp_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-setup-totp",
-            function_name=f"{STAGE}-setup-totp",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="setup-totp-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/setup-totp"))
-        )
-
-        self.setup_totp_alias = lmb.Alias(
-            scope=self,
-            version=self.setup_totp_handler.current_version,
-            id=f"{STAGE}-setup-totp-alias",
-            alias_name="setup-totp-alias",
-        )
-
-        self.setup_totp_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:AssociateSoftwareToken",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.setup_totp_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:AssociateSoftwareToken"
-                ]
-            )
-        )
-
-        # Get user details & alias
-        self.get_user_details_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-get-user-details",
-            function_name=f"{STAGE}-get-user-details",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="get-user-details-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/get-user-details"))
-        )
-
-        self.get_user_details_alias = lmb.Alias(
+        # Execution role shared by every handler, allowed the union of route actions
+        self.handler_role = Role(
             scope=self,
-            version=self.get_user_details_handler.current_version,
-            id=f"{STAGE}-get-user-details-alias",
-            alias_name="get-user-details-alias"
-        )
-
-        self.get_user_details_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "dynamodb:GetItem",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.get_user_details_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "dynamodb:GetItem"
-                ]
-            )
-        )
-
-        # Change password & alias
-        self.change_password_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-change-password",
-            function_name=f"{STAGE}-change-password",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="change-password-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/change-password"))
-        )
-
-        self.change_password_alias = lmb.Alias(
-            scope=self,
-            version=self.change_password_handler.current_version,
-            id=f"{STAGE}-change-password-alias",
-            alias_name="change-password-alias"
-        )
-
-        self.change_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:ChangePassword",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.change_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:ChangePassword"
-                ]
+            id="authentication-handler-role",
+            assumed_by=ServicePrincipal("lambda.amazonaws.com"),
+            managed_policies=[
+                ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole")
+            ]
+        )
+
+        # Route actions scoped per service, to the user pool & the per organization users tables
+        actions = {action for route in AUTHENTICATION_ROUTES for action in route.actions}
+        service_resources = {
+            "cognito-idp":[self.cognito_user_pool.user_pool_arn],
+            "dynamodb":[self.format_arn(service="dynamodb", resource="table", resource_name="users-*")]
+        }
+
+        for service, resources in service_resources.items():
+            self.handler_role.add_to_policy(
+                PolicyStatement(
+                    effect=Effect.ALLOW,
+                    resources=resources,
+                    actions=sorted(action for action in actions if action.startswith(f"{service}:"))
+                )
             )
-        )
-
-        # Forgot password & alias
-        self.forgot_password_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-forgot-password",
-            function_name=f"{STAGE}-forgot-password",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="forgot-password-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/forgot-password"))
-        )
-
-        self.forgot_password_alias = lmb.Alias(
-            scope=self,
-            version=self.forgot_password_handler.current_version,
-            id=f"{STAGE}-forgot-password-alias",
-            alias_name="forgot-password-alias"
-        )
 
-        self.forgot_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:ForgotPassword",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
+        # Lambda handlers & aliases keyed by route
+        self.handlers = {}
+        self.aliases = {}
 
-        self.forgot_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:ForgotPassword"
-                ]
-            )
-        )
+        for route in AUTHENTICATION_ROUTES:
+            name = f"{stage}-{route.path}"
 
-        # Confirm forgot password & alias
-        self.confirm_forgot_password_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-confirm-forgot-password",
-            function_name=f"{STAGE}-confirm-forgot-password",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
+            # Handler
+            handler = lmb.Function(
                 scope=self,
-                id="confirm-forgot-password-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/confirm-forgot-password"))
-        )
-
-        self.confirm_forgot_password_alias = lmb.Alias(
-            scope=self,
-            version=self.confirm_forgot_password_handler.current_version,
-            id=f"{STAGE}-confirm-forgot-password-alias",
-            alias_name="confirm-forgot-password-alias"
-        )
-
-        self.confirm_forgot_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:ConfirmForgotPassword",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
-        self.confirm_forgot_password_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:ConfirmForgotPassword"
-                ]
+                id=f"{name}-handler",
+                function_name=f"{name}-handler",
+                handler="handler.handler",
+                runtime=HANDLER_RUNTIME,
+                description=route.description,
+                role=self.handler_role,
+                timeout=HANDLER_TIMEOUT,
+                memory_size=WARM_HANDLER_MEMORY if route.path in WARM_ROUTES else HANDLER_MEMORY,
+                code=lmb.Code.from_asset(
+                    path.join(LAMBDAS_DIR, route.path),
+                    exclude=ASSET_EXCLUDE
+                )
             )
-        )
-
-        # Resend confirmation code & alias
-        self.resend_confirmation_code_handler = lmb.Function(
-            scope=self,
-            id=f"{STAGE}-resend-confirmation-code",
-            function_name=f"{STAGE}-resend-confirmation-code",
-            handler="handler.handler",
-            runtime=lmb.Runtime.PYTHON_3_8,
-            role=Role(
-                scope=self,
-                id="resend-confirmation-code-handler-role",
-                assumed_by=ServicePrincipal("lambda.amazonaws.com"),
-                managed_policies=[
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole"),
-                    ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole"),
-                ]
-            ),
-            vpc=vpc_stack.vpc,
-            timeout=cdk.Duration.minutes(15),
-            code=lmb.Code.from_asset(path.join(current_directory, "../../src/backend/lambdas/serverless-authentication/resend-confirmation-code"))
-        )
-
-        self.resend_confirmation_code_alias = lmb.Alias(
-            scope=self,
-            version=self.resend_confirmation_code_handler.current_version,
-            id=f"{STAGE}-resend-confirmation-code-alias",
-            alias_name="resend-confirmation-code-alias"
-        )
 
-        self.resend_confirmation_code_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "cognito:ResendConfirmationCode",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
+            # Graviton, handlers are pure python so the same asset runs on arm64
+            handler.node.default_child.add_property_override("Architectures", HANDLER_ARCHITECTURES)
+
+            # Alias, prod only so other stages can hotswap $LATEST without publishing versions
+            if is_prod:
+                self.aliases[route.path] = lmb.Alias(
+                    scope=self,
+                    version=handler.current_version,
+                    id=f"{name}-alias",
+                    alias_name=f"{route.path}-alias",
+                    provisioned_concurrent_executions=(
+                        PROVISIONED_CONCURRENCY if route.path in WARM_ROUTES else None
+                    )
+                )
 
-        self.resend_confirmation_code_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.ALLOW,
-                resources=["*"],
-                actions=[
-                    "cognito:ResendConfirmationCode"
-                ]
-            )
-        )
+            self.handlers[route.path] = handler
 
         ######################################
         #   Create & configure API Gateway   #
@@ -709,418 +390,105 @@ class AuthenticationStack(cdk.Stack):
                 cache_data_encrypted=True,
                 cache_ttl=cdk.Duration.minutes(5),
                 caching_enabled=False,
-                data_trace_enabled=True,
-                logging_level=MethodLoggingLevel.INFO,
+                data_trace_enabled=not is_prod,
+                logging_level=MethodLoggingLevel.ERROR if is_prod else MethodLoggingLevel.INFO,
                 metrics_enabled=False,
                 throttling_burst_limit=5000,
                 throttling_rate_limit=5000,
-                stage_name=STAGE
+                stage_name=stage
             ),
             default_cors_preflight_options=CorsOptions(
-                allow_origins=["*"],
-                allow_methods=["GET", "POST"]
+                allow_origins=[getenv("FRONTEND_ORIGIN", "*")],
+                allow_methods=["GET", "POST", "OPTIONS"],
+                max_age=cdk.Duration.hours(1)
             )
         )
 
-        # Signup lambda integration
-        self.signup = self.api_gateway.root.add_resource("signup")
-        self.signup_lambda_integration = LambdaIntegration(
-            handler=self.signup_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/signup/schema.json"), "r")))}
-        )
-        self.signup.add_method("POST", self.signup_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-signup",
-            model_name=f"{STAGE}Signup",
-            description="Default schema for signup route",
-            schema=JsonSchema(
-                title=f"{STAGE}-signup",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "password":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "userAttributes":JsonSchema(
-                        type=JsonSchemaType.OBJECT,
-                        properties={
-                            "name":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "preferred_username":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "custom:type":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "custom:organization":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            )
-                        }
-                    )
-                }
-            )
+        # Single body validator shared by every route
+        self.request_validator = RequestValidator(
+            scope=self,
+            id=f"{stage}-request-body-validator",
+            rest_api=self.api_gateway,
+            request_validator_name=f"{stage}-request-body-validator",
+            validate_request_body=True,
+            validate_request_parameters=False
         )
 
-        # Confirm signup lambda integration
-        self.confirm_signup = self.api_gateway.root.add_resource("confirm-signup")
-        self.confirm_signup_lambda_integration = LambdaIntegration(
-            handler=self.confirm_signup_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/confirm-signup/schema.json"), "r")))}
-        )
-        self.confirm_signup.add_method("POST", self.confirm_signup_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-confirm-signup",
-            model_name=f"{STAGE}ConfirmSignup",
-            description="Default schema for confirm signup route",
-            schema=JsonSchema(
-                title=f"{STAGE}-confirm-signup",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "confirmationCode":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "userAttributes":JsonSchema(
-                        type=JsonSchemaType.OBJECT,
-                        properties={
-                            "email":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "name":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "username":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "custom:role":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                            "custom:organization":JsonSchema(
-                                type=JsonSchemaType.STRING
-                            ),
-                        }
-                    )
-                }
-            )
-        )
+        # Create route resources, lambda integrations & request models
+        self.api_resources = {}
+        self.request_models = {}
 
-        # Signin lambda integration
-        self.signin = self.api_gateway.root.add_resource("signin")
-        self.signin_lambda_integration = LambdaIntegration(
-            handler=self.signin_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/signin/schema.json"), "r")))}
-        )
-        self.signin.add_method("POST", self.signin_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-signin",
-            model_name=f"{STAGE}Signin",
-            description="Default schema for signin route",
-            schema=JsonSchema(
-                title=f"{STAGE}-signin",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "password":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "authFlow":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                }
-            )
-        )
+        root = self.api_gateway.root
+        add_model = self.api_gateway.add_model
 
-        # Confirm signin lambda integration
-        self.confirm_signin = self.api_gateway.root.add_resource("confirm-signin")
-        self.confirm_signin_lambda_integration = LambdaIntegration(
-            handler=self.confirm_signin_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/confirm-signin/schema.json"),"r")))}
-        )
-        self.confirm_signin.add_method("POST", self.confirm_signin_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-confirm-signin",
-            model_name=f"{STAGE}ConfirmSignin",
-            description="Default schema for confirm signin route",
-            schema=JsonSchema(
-                title=f"{STAGE}-confirm-signin",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "mfaCode":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "sessionToken":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "challengeName":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                }
-            )
-        )
+        for route in AUTHENTICATION_ROUTES:
 
-        # Setup TOTP lambda integration
-        self.setup_totp = self.api_gateway.root.add_resource("setup-totp")
-        self.setup_totp_lambda_integration = LambdaIntegration(
-            handler=self.setup_totp_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/setup-totp/schema.json"),"r")))}
-        )
-        self.setup_totp.add_method("POST", self.setup_totp_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-setup-totp",
-            model_name=f"{STAGE}SetupTotp",
-            description="Default schema for setup totp route",
-            schema=JsonSchema(
-                title=f"{STAGE}-setup-totp",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "mfaCode":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "sessionCode":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "sessionToken":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    )
-                }
-            )
-        )
+            # Stage scoped identifiers, e.g. dev-confirm-signup & devConfirmSignup
+            resource_id = f"{stage}-{route.path}"
+            model_name = stage + "".join(word.title() for word in route.path.split("-"))
 
-        # Get user details lambda integration
-        self.get_user_details = self.api_gateway.root.add_resource("get-user-details")
-        self.get_user_details_lambda_integration = LambdaIntegration(
-            handler=self.get_user_details_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/get-user-details/schema.json"),"r")))}
-        )
-        self.get_user_details.add_method("POST", self.get_user_details_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-get-user-details",
-            model_name=f"{STAGE}GetUserDetails",
-            description="Default schema for getting user details route",
-            schema=JsonSchema(
-                title=f"{STAGE}-get-user-details",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "accesToken":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    )
-                }
-            )
-        )
+            # Request model, shared between routes with the same body shape
+            properties = request_properties(route.fields, route.nested)
+            shape = request_shape(route.fields, route.nested)
 
-        # Change password lambda integration
-        self.change_password = self.api_gateway.root.add_resource("change-password")
-        self.change_password_lambda_integration = LambdaIntegration(
-            handler=self.change_password_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/change-password/schema.json"),"r")))}
-        )
-        self.change_password.add_method("POST", self.change_password_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-change-password",
-            model_name=f"{STAGE}ChangePassword",
-            description="Default schema for changing password route",
-            schema=JsonSchema(
-                title=f"{STAGE}-change-password",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "oldPassword":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "newPassword":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "accessToken":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    )
-                }
-            )
-        )
-
-        # Forgot password lambda integration
-        self.forgot_password = self.api_gateway.root.add_resource("forgot-password")
-        self.forgot_password_lambda_integration = LambdaIntegration(
-            handler=self.forgot_password_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/forgot-password/schema.json"),"r")))}
-        )
-        self.forgot_password.add_method("POST", self.forgot_password_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-forgot-password",
-            model_name=f"{STAGE}ForgotPassword",
-            description="Default schema for forgot password route",
-            schema=JsonSchema(
-                title=f"{STAGE}-forgot-password",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    )
-                }
-            )
-        )
-
-        # Confirm forgot password lambda integration
-        self.confirm_forgot_password = self.api_gateway.root.add_resource("confirm-forgot-password")
-        self.confirm_forgot_password_lambda_integration = LambdaIntegration(
-            handler=self.confirm_forgot_password_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/confirm-forgot-password/schema.json"),"r")))}
-        )
-        self.confirm_forgot_password.add_method("POST", self.confirm_forgot_password_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-confirm-forgot-password",
-            model_name=f"{STAGE}ConfirmForgotPassword",
-            description="Default schema for confirm forgot password route",
-            schema=JsonSchema(
-                title=f"{STAGE}-confirm-forgot-password",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "newPassword":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "confirmationCode":JsonSchema(
-                        type=JsonSchemaType.STRING
+            if shape not in self.request_models:
+                self.request_models[shape] = add_model(
+                    id=resource_id,
+                    model_name=model_name,
+                    description=f"Default schema for {route.path.replace('-', ' ')} route",
+                    schema=JsonSchema(
+                        title=resource_id,
+                        type=JsonSchemaType.OBJECT,
+                        properties=properties
                     )
-                }
-            )
-        )
+                )
 
-        # Resend confirmation code lambda integration
-        self.resend_confirmation_code = self.api_gateway.root.add_resource("resend-confirmation-code")
-        self.resend_confirmation_code_lambda_integration = LambdaIntegration(
-            handler=self.resend_confirmation_code_handler,
-            allow_test_invoke=True,
-            proxy=False,
-            # request_templates={"application/json":str(load(open(path.join(current_directory, "../../src/backend/lambdas/resend-confirmation-code/schema.json"),"r")))}
-        )
-        self.resend_confirmation_code.add_method("POST", self.resend_confirmation_code_lambda_integration)
-        self.api_gateway.add_model(
-            id=f"{STAGE}-resend-confirmation-code",
-            model_name=f"{STAGE}ResendConfirmationCode",
-            description="Default schema for resend confirmation code route",
-            schema=JsonSchema(
-                title=f"{STAGE}-resend-confirmation-code",
-                type=JsonSchemaType.OBJECT,
-                properties={
-                    "username":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientId":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    ),
-                    "clientSecret":JsonSchema(
-                        type=JsonSchemaType.STRING
-                    )
-                }
+            # Lambda integration
+            self.api_resources[route.path] = root.add_resource(route.path)
+            self.api_resources[route.path].add_method(
+                "POST",
+                lambda_integration(self.aliases.get(route.path, self.handlers[route.path])),
+                method_responses=METHOD_RESPONSES,
+                request_models={"application/json": self.request_models[shape]},
+                request_validator=self.request_validator
             )
-        )
 
         ######################################
         #  Config per lambda failure Alarms  #
         #   create timed canary deployment   #
         ######################################
 
-        # Zipped alias name & function
-        zipped = [
-            (f"{STAGE}-signup-alias", self.signup_alias),
-            (f"{STAGE}-confirm-signup-alias", self.confirm_signup_alias),
-            (f"{STAGE}-signin-alias", self.signin_alias),
-            (f"{STAGE}-confirm-signin-alias", self.confirm_signin_alias),
-            (f"{STAGE}-setup-totp-alias", self.setup_totp_alias),
-            (f"{STAGE}-get-user-details-alias", self.get_user_details_alias),
-            (f"{STAGE}-change-password-alias", self.change_password_alias),
-            (f"{STAGE}-forgot-password-alias", self.forgot_password_alias),
-            (f"{STAGE}-confirm-forgot-password-alias", self.confirm_forgot_password_alias),
-            (f"{STAGE}-resend-confirmation-code-alias", self.resend_confirmation_code_alias)
-        ]
-
-        for name, alias in zipped:
-
-            # Alarm configuration 
+        # Prod only, other stages have no aliases to shift traffic between
+        if is_prod:
+
+            # Alarm & canary deployment modules, only needed from here on
+            import aws_cdk.aws_codedeploy as codedeploy
+            import aws_cdk.aws_cloudwatch as cloudwatch
+
+            # Single API wide 5XX alarm, shared by every deployment group
             failure_alarm = cloudwatch.Alarm(
-                scope=self, 
-                id=f"{name}-alarm",
+                scope=self,
+                id=f"{stage}-authentication-5xx-alarm",
                 metric=cloudwatch.Metric(
-                    metric_name="5XXError",
-                    namespace=f"AWS/ApiGateway/Authentication/{name}",
-                    dimensions={"ApiName": "authentication"},
+                    metric_name=ALARM_METRIC_NAME,
+                    namespace="AWS/ApiGateway",
+                    dimensions=ALARM_DIMENSIONS,
                     statistic="Sum",
-                    period=cdk.Duration.minutes(1)),
+                    period=ALARM_PERIOD),
                 threshold=1,
                 evaluation_periods=1)
 
-            # Canary deployment
-            codedeploy.LambdaDeploymentGroup(
-                scope=self,
-                id=f"{name}-deployment-group",
-                alias=alias,
-                deployment_config=codedeploy.LambdaDeploymentConfig.CANARY_10_PERCENT_10_MINUTES,
-                alarms=[failure_alarm])
+            deployment_config = codedeploy.LambdaDeploymentConfig.CANARY_10_PERCENT_10_MINUTES
+
+            for route in AUTHENTICATION_ROUTES:
+
+                # Canary deployment
+                codedeploy.LambdaDeploymentGroup(
+                    scope=self,
+                    id=f"{stage}-{route.path}-alias-deployment-group",
+                    alias=self.aliases[route.path],
+                    deployment_config=deployment_config,
+                    alarms=[failure_alarm])
 
 
         ######################################
@@ -5,7 +5,7 @@
 # ---------------------------------------------------------------
 
 # Native imports
-from os import getenv, path
+from os import path, environ
 from dotenv import load_dotenv
 
 # CDK Imports - DevOps
@@ -32,102 +32,71 @@ from .webservice_stage import AuthenticationWebServiceStage, RTCWebServiceStage
 # Current directoy
 current_directory = path.dirname(__file__)
 
-# Env vars
-load_dotenv(path.join(current_directory, "../.env"))
-STAGE=getenv("STAGE")
+# Env vars, the .env file is only read when the environment is not already set up (e.g. in CI)
+env_path = path.join(current_directory, "../.env")
 
-# AWS Envs
-REGION=getenv("REGION")
-ACCOUNT_NUMBER=getenv("ACCOUNT_NUMBER")
+if "STAGE" not in environ and path.isfile(env_path):
+    load_dotenv(env_path)
 
-# GitHub envs
-REPO_NAME=getenv("REPO_NAME")
-REPO_OWNER=getenv("REPO_OWNER")
+# Stage, AWS & GitHub envs, read together once the .env file is loaded
+STAGE, REGION, ACCOUNT_NUMBER, REPO_NAME, REPO_OWNER = (
+    environ.get(key) for key in ("STAGE", "REGION", "ACCOUNT_NUMBER", "REPO_NAME", "REPO_OWNER")
+)
+
+# GitHub OAuth token used by the source action
+GITHUB_TOKEN = cdk.SecretValue.secrets_manager("github-token")
+
+# EC2 instances targeted by the backend server deployment group
+SERVER_INSTANCE_TAGS = code_deploy.InstanceTagSet({"deployment-group": ["thea-backend-server"]})
+
+# Synth install step of the backend pipeline
+INSTALL_COMMAND="npm install -g aws-cdk && pip install -r requirements.txt"
 
 
 # ---------------------------------------------------------------
 #                          CI/CD Pipeline
 # ---------------------------------------------------------------
 
-class RtcCicdPipelineStack(cdk.Stack):
+class TheaBackendCicdPipelineStack(cdk.Stack):
   def __init__(self, scope: cdk.Construct, id: str, **kwargs):
     super().__init__(scope, id, **kwargs)
 
     ######################################
-    #  Create & config deployment stage  #
+    #  Create & configure CICD pipeline  #
     ######################################
 
-    # Instantiate artifacts
-    self.rtc_source_artifact = codepipeline.Artifact(artifact_name="rtc-source-artifact")
-    self.rtc_cloud_assembly_artifact = codepipeline.Artifact(artifact_name="rtc-cloud-assembly-artifact")
+    # Instantiate artifacts, one source checkout feeds every deployment
+    self.source_artifact = codepipeline.Artifact(artifact_name="thea-backend-source-artifact")
+    self.cloud_assembly_artifact = codepipeline.Artifact(artifact_name="thea-backend-cloud-assembly-artifact")
 
-    # Instantiate authentication pipeline
-    self.rtc_pipeline = pipelines.CdkPipeline(
+    # Instantiate backend pipeline
+    self.pipeline = pipelines.CdkPipeline(
         scope=self,
-        id="serverless-rtc-cicd-pipeline",
-        cloud_assembly_artifact=self.rtc_cloud_assembly_artifact,
-        pipeline_name="serverless-rtc-cicd-pipeline",
+        id="thea-backend-cicd-pipeline",
+        cloud_assembly_artifact=self.cloud_assembly_artifact,
+        pipeline_name="thea-backend-cicd-pipeline",
         source_action=cpactions.GitHubSourceAction(
-            action_name="serverless-rtc-deployment",
-            output=self.rtc_source_artifact,
-            oauth_token=cdk.SecretValue.secrets_manager("github-token"),
+            action_name="thea-backend-source",
+            output=self.source_artifact,
+            oauth_token=GITHUB_TOKEN,
             owner=REPO_OWNER,
             repo=REPO_NAME,
-            trigger=cpactions.GitHubTrigger.POLL
+            trigger=cpactions.GitHubTrigger.WEBHOOK
         ),
         synth_action=pipelines.SimpleSynthAction(
-            source_artifact=self.rtc_source_artifact,
-            cloud_assembly_artifact=self.rtc_cloud_assembly_artifact,
-            install_command="npm install -g aws-cdk && pip install -r requirements.txt",
+            source_artifact=self.source_artifact,
+            cloud_assembly_artifact=self.cloud_assembly_artifact,
+            install_command=INSTALL_COMMAND,
             # build_command="pytest unittests", # Add security scans
             synth_command="cdk synth")
         )
 
-    # Authentication deployment - production
-    self.rtc_pipeline.add_application_stage(
-        RTCWebServiceStage(
-            scope=self, 
-            id=STAGE, 
-            env={'account': ACCOUNT_NUMBER,'region': REGION}
-        )
-    )
-
-class AuthenticationCicdPipelineStack(cdk.Stack):
-  def __init__(self, scope: cdk.Construct, id: str, **kwargs):
-    super().__init__(scope, id, **kwargs)
-
     ######################################
-    #    Authentication CI/CD pipeline   #
+    #    Serverless deployment stages    #
     ######################################
 
-    # Instantiate artifacts
-    self.authentication_source_artifact = codepipeline.Artifact(artifact_name="authentication-source-artifact")
-    self.authentication_cloud_assembly_artifact = codepipeline.Artifact(artifact_name="authentication-cloud-assembly-artifact")
-
-    # Instantiate authentication pipeline
-    self.authentication_pipeline = pipelines.CdkPipeline(
-        scope=self,
-        id="serverless-authentication-cicd-pipeline",
-        cloud_assembly_artifact=self.authentication_cloud_assembly_artifact,
-        pipeline_name="serverless-authentication-cicd-pipeline",
-        source_action=cpactions.GitHubSourceAction(
-            action_name="serverless-authentication-deployment",
-            output=self.authentication_source_artifact,
-            oauth_token=cdk.SecretValue.secrets_manager("github-token"),
-            owner=REPO_OWNER,
-            repo=REPO_NAME,
-            trigger=cpactions.GitHubTrigger.POLL
-        ),
-        synth_action=pipelines.SimpleSynthAction(
-            source_artifact=self.authentication_source_artifact,
-            cloud_assembly_artifact=self.authentication_cloud_assembly_artifact,
-            install_command="npm install -g aws-cdk && pip install -r requirements.txt",
-            # build_command="pytest unittests", # Add security scans
-            synth_command="cdk synth")
-        )
-
-    # Authentication deployment - production
-    self.authentication_pipeline.add_application_stage(
+    # Authentication deployment, keeps the stage id (and so the {STAGE}-{STAGE} stack) of its former pipeline
+    self.pipeline.add_application_stage(
         AuthenticationWebServiceStage(
             scope=self, 
             id=STAGE, 
@@ -135,9 +104,14 @@ class AuthenticationCicdPipelineStack(cdk.Stack):
         )
     )
 
-class TheaBackendServerCicdPipelineStack(cdk.Stack):
-  def __init__(self, scope: cdk.Construct, id: str, **kwargs):
-    super().__init__(scope, id, **kwargs)
+    # RTC deployment, its former stage id gave it the same {STAGE}-{STAGE} stack name as authentication
+    self.pipeline.add_application_stage(
+        RTCWebServiceStage(
+            scope=self, 
+            id=f"{STAGE}-rtc", 
+            env={'account': ACCOUNT_NUMBER,'region': REGION}
+        )
+    )
 
     ######################################
     #       Configure code deploy        #
@@ -166,43 +140,14 @@ class TheaBackendServerCicdPipelineStack(cdk.Stack):
             ]
         ),
         deployment_config=code_deploy.ServerDeploymentConfig.ONE_AT_A_TIME,
-        ec2_instance_tags=code_deploy.InstanceTagSet(
-            {
-                "deployment-group": ["thea-backend-server"]
-            }
-        ),
-    )
-
-    ######################################
-    #  Create & configure CICD pipeline  #
-    ######################################
-
-    # Instantiate backend server CI/CD pipeline
-    self.backend_server_pipeline = codepipeline.Pipeline(
-        scope=self,
-        id="thea-backend-server-pipeline",
-        pipeline_name="thea-backend-server-pipeline",
-    )
-
-    # Source stage
-    self.source_stage = self.backend_server_pipeline.add_stage(stage_name="Source")     # Declare source stage
-    self.source_output = codepipeline.Artifact(artifact_name='Source')                  # Create source artifact output
-    self.source_stage.add_action(                                                       # Pull source code from GitHub
-        cpactions.GitHubSourceAction(
-            action_name="thea-backend-deployment",
-            output=self.source_output,
-            oauth_token=cdk.SecretValue.secrets_manager("github-token"),
-            repo=REPO_NAME,
-            owner=REPO_OWNER,
-            trigger=cpactions.GitHubTrigger.POLL
-        )
+        ec2_instance_tags=SERVER_INSTANCE_TAGS,
     )
 
-    # Deployment stage
-    self.deploy_stage = self.backend_server_pipeline.add_stage(stage_name="Deploy")     # Declare deployment stage
-    self.deploy_stage.add_action(
+    # Server deployment stage, deploys the same source checkout as the serverless stages
+    self.deploy_stage = self.pipeline.add_stage("deploy-server")
+    self.deploy_stage.add_actions(
         cpactions.CodeDeployServerDeployAction(
-            input=self.source_output,
+            input=self.source_artifact,
             action_name="deploy-server",
             deployment_group=self.deployment_group
         )
@@ -30,8 +30,207 @@ from aws_cdk.aws_s3 import Bucket, BucketEncryption, CorsRule, HttpMethods
 
 # Load env vars
 load_dotenv()
+STAGE=getenv("STAGE")
 ACCOUNT_NUMBER=getenv("ACCOUNT_NUMBER")
 
+# Throwaway stages, anything else (prod, unset or misspelled STAGE) is treated as long lived
+EPHEMERAL_STAGES = ("dev", "test")
+
+# Frontend origin allowed by the bucket's CORS rule & how long browsers may cache its preflight (seconds)
+FRONTEND_ORIGIN=getenv("FRONTEND_ORIGIN", "*")
+CORS_MAX_AGE=3600
+
+# Headers the frontend sends with document uploads & signed S3 requests
+ALLOWED_HEADERS = (
+    "x-amz-meta-upload-date",
+    "x-amz-meta-document-name",
+    "x-amz-meta-description",
+    "x-amz-meta-attached-by",
+    "Content-Type",
+    "Authorization",
+    "Date",
+    "x-amz-content-sha256",
+    "x-amz-date",
+    "x-amz-security-token"
+)
+
+# Bucket CORS rule, a plain struct with no stack scoped tokens so it is built once at import
+CORS_RULE = CorsRule(
+    allowed_methods=[
+        HttpMethods.GET,
+        HttpMethods.POST
+    ],
+    allowed_origins=[
+        FRONTEND_ORIGIN
+    ],
+    max_age=CORS_MAX_AGE,
+    allowed_headers=list(ALLOWED_HEADERS)
+)
+
+# Provisioned capacity floor, ceiling & target utilization of the hot chat & connection tables
+HOT_TABLE_CAPACITY = {
+    "min_capacity":25,
+    "max_capacity":500,
+    "target_utilization_percent":70
+}
+
+# Hot tables are provisioned & autoscaled in prod only, other stages stay on demand with no standing capacity
+HOT_TABLES_PROVISIONED = STAGE == "prod"
+
+HOT_TABLE_BILLING = {
+    "billing_mode":BillingMode.PROVISIONED,
+    "read_capacity":HOT_TABLE_CAPACITY["min_capacity"],
+    "write_capacity":HOT_TABLE_CAPACITY["min_capacity"]
+} if HOT_TABLES_PROVISIONED else {
+    "billing_mode":BillingMode.PAY_PER_REQUEST
+}
+
+HOT_INDEX_CAPACITY = {
+    "read_capacity":HOT_TABLE_CAPACITY["min_capacity"],
+    "write_capacity":HOT_TABLE_CAPACITY["min_capacity"]
+} if HOT_TABLES_PROVISIONED else {}
+
+# Dynamo table configurations, as (table key, configuration) pairs
+DYNAMODB_CONFIGURATIONS = (
+    ("projects", {
+        "table_configuration": {
+            "id":f"Projects-{ACCOUNT_NUMBER}",
+            "table_name":f"Projects-{ACCOUNT_NUMBER}",
+            "partition_key":Attribute(
+                name="projectId",
+                type=AttributeType.STRING
+            ),
+            "billing_mode":BillingMode.PAY_PER_REQUEST,
+            "encryption":TableEncryption.AWS_MANAGED,
+            "removal_policy":cdk.RemovalPolicy.DESTROY
+            # "read_capacity":5, # enabled if billing mode is PROVISIONED
+            # "write_capacity":5, # enabled if billing mode is PROVISIONED
+            # "replication_regions":[],
+        },
+        "global_secondary_index": [
+            {
+                "partition_key":Attribute(
+                    name="customerId",
+                    type=AttributeType.STRING
+                ),
+                # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                "index_name":"customerId",
+                "projection_type":ProjectionType.ALL # Default
+            }
+        ]
+    }),
+    ("workflows", {
+        "table_configuration": {
+            "id":f"Workflows-{ACCOUNT_NUMBER}",
+            "table_name":f"Workflows-{ACCOUNT_NUMBER}",
+            "partition_key":Attribute(
+                name="itemId",
+                type=AttributeType.STRING
+            ),
+            "billing_mode":BillingMode.PAY_PER_REQUEST,
+            "encryption":TableEncryption.AWS_MANAGED,
+            "removal_policy":cdk.RemovalPolicy.DESTROY
+            # "read_capacity":5, # enabled if billing mode is PROVISIONED
+            # "write_capacity":5, # enabled if billing mode is PROVISIONED
+            # "replication_regions":[],
+        },
+        "global_secondary_index": [
+            {
+                "partition_key":Attribute(
+                    name="typeId",
+                    type=AttributeType.STRING
+                ),
+                # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                "index_name":"typeId",
+                "projection_type":ProjectionType.ALL # Default
+            }
+        ]
+    }),
+    ("chat_records", {
+        "table_configuration": {
+            "id":f"ChatRecords-{ACCOUNT_NUMBER}",
+            "table_name":f"ChatRecords-{ACCOUNT_NUMBER}",
+            "partition_key":Attribute(
+                name="messageId",
+                type=AttributeType.STRING
+            ),
+            **HOT_TABLE_BILLING,
+            "encryption":TableEncryption.AWS_MANAGED,
+            "removal_policy":cdk.RemovalPolicy.DESTROY
+            # "replication_regions":[],
+        },
+        "auto_scaling":HOT_TABLE_CAPACITY if HOT_TABLES_PROVISIONED else None,
+        "global_secondary_index": [
+            {
+                "partition_key":Attribute(
+                    name="itemId",
+                    type=AttributeType.STRING
+                ),
+                **HOT_INDEX_CAPACITY,
+                "index_name":"itemId",
+                "projection_type":ProjectionType.ALL # Default
+            }
+        ]
+    }),
+    ("connections_manager_", {
+        "table_configuration": {
+            "id":f"OnlineConnection-{ACCOUNT_NUMBER}",
+            "table_name":f"OnlineConnection-{ACCOUNT_NUMBER}",
+            "partition_key":Attribute(
+                name="connectionId",
+                type=AttributeType.STRING
+            ),
+            **HOT_TABLE_BILLING,
+            "encryption":TableEncryption.AWS_MANAGED,
+            "removal_policy":cdk.RemovalPolicy.DESTROY,
+            "time_to_live_attribute":"ttl" # Items carrying an epoch "ttl" expire for free
+            # "replication_regions":[],
+        },
+        "auto_scaling":HOT_TABLE_CAPACITY if HOT_TABLES_PROVISIONED else None,
+        "global_secondary_index": [
+            {
+                "partition_key":Attribute(
+                    name="itemId",
+                    type=AttributeType.STRING
+                ),
+                **HOT_INDEX_CAPACITY,
+                "index_name":"itemId",
+                "projection_type":ProjectionType.KEYS_ONLY # Fan-out only needs connectionId
+            }
+        ]
+    }),
+    ("users", {
+        "table_configuration": {
+            "id":f"Users-{ACCOUNT_NUMBER}",
+            "table_name":f"Users-{ACCOUNT_NUMBER}",
+            "partition_key":Attribute(
+                name="userId",
+                type=AttributeType.STRING
+            ),
+            "billing_mode":BillingMode.PAY_PER_REQUEST,
+            "encryption":TableEncryption.AWS_MANAGED,
+            "removal_policy":cdk.RemovalPolicy.DESTROY
+            # "read_capacity":5, # enabled if billing mode is PROVISIONED
+            # "write_capacity":5, # enabled if billing mode is PROVISIONED
+            # "replication_regions":[],
+        },
+        "global_secondary_index": [
+            {
+                "partition_key":Attribute(
+                    name="organization",
+                    type=AttributeType.STRING
+                ),
+                # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
+                "index_name":"organization",
+                "projection_type":ProjectionType.ALL # Default
+            }
+        ]
+    })
+)
+
 # ---------------------------------------------------------------
 #                           Custom VPC
 # ---------------------------------------------------------------
@@ -45,143 +244,10 @@ class CdkDataStack(cdk.Stack):
         # Create & Configure DynamoDB Tables #
         ######################################
         
-        # Dynamo table configurations
-        self.dynamodb_configurations={
-            "projects":{
-                "table_configuration": {
-                    "id":f"Projects-{ACCOUNT_NUMBER}",
-                    "table_name":f"Projects-{ACCOUNT_NUMBER}",
-                    "partition_key":Attribute(
-                        name="projectId",
-                        type=AttributeType.STRING
-                    ),
-                    "billing_mode":BillingMode.PAY_PER_REQUEST,
-                    "encryption":TableEncryption.AWS_MANAGED,
-                    "removal_policy":cdk.RemovalPolicy.DESTROY
-                    # "read_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "write_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "replication_regions":[],
-                },
-                "global_secondary_index": [
-                    {
-                        "partition_key":Attribute(
-                            name="customerId",
-                            type=AttributeType.STRING
-                        ),
-                        # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        "index_name":"customerId",
-                        "projection_type":ProjectionType.ALL # Default
-                    }
-                ]
-            },
-            "workflows":{
-                "table_configuration": {
-                    "id":f"Workflows-{ACCOUNT_NUMBER}",
-                    "table_name":f"Workflows-{ACCOUNT_NUMBER}",
-                    "partition_key":Attribute(
-                        name="itemId",
-                        type=AttributeType.STRING
-                    ),
-                    "billing_mode":BillingMode.PAY_PER_REQUEST,
-                    "encryption":TableEncryption.AWS_MANAGED,
-                    "removal_policy":cdk.RemovalPolicy.DESTROY
-                    # "read_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "write_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "replication_regions":[],
-                },
-                "global_secondary_index": [
-                    {
-                        "partition_key":Attribute(
-                            name="typeId",
-                            type=AttributeType.STRING
-                        ),
-                        # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        "index_name":"typeId",
-                        "projection_type":ProjectionType.ALL # Default
-                    }
-                ]
-            },
-            "chat_records":{
-                "table_configuration": {
-                    "id":f"ChatRecords-{ACCOUNT_NUMBER}",
-                    "table_name":f"ChatRecords-{ACCOUNT_NUMBER}",
-                    "partition_key":Attribute(
-                        name="messageId",
-                        type=AttributeType.STRING
-                    ),
-                    "billing_mode":BillingMode.PAY_PER_REQUEST,
-                    "encryption":TableEncryption.AWS_MANAGED,
-                    "removal_policy":cdk.RemovalPolicy.DESTROY
-                    # "read_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "write_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "replication_regions":[],
-                },
-                "global_secondary_index": [
-                    {
-                        "partition_key":Attribute(
-                            name="itemId",
-                            type=AttributeType.STRING
-                        ),
-                        # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        "index_name":"itemId",
-                        "projection_type":ProjectionType.ALL # Default
-                    }
-                ]
-            },
-            "connections_manager_":{
-                "table_configuration": {
-                    "id":f"OnlineConnection-{ACCOUNT_NUMBER}",
-                    "table_name":f"OnlineConnection-{ACCOUNT_NUMBER}",
-                    "partition_key":Attribute(
-                        name="connectionId",
-                        type=AttributeType.STRING
-                    ),
-                    "billing_mode":BillingMode.PAY_PER_REQUEST,
-                    "encryption":TableEncryption.AWS_MANAGED,
-                    "removal_policy":cdk.RemovalPolicy.DESTROY
-                    # "read_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "write_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "replication_regions":[],
-                },
-                "global_secondary_index": []
-            },
-            "users":{
-                "table_configuration": {
-                    "id":f"Users-{ACCOUNT_NUMBER}",
-                    "table_name":f"Users-{ACCOUNT_NUMBER}",
-                    "partition_key":Attribute(
-                        name="userId",
-                        type=AttributeType.STRING
-                    ),
-                    "billing_mode":BillingMode.PAY_PER_REQUEST,
-                    "encryption":TableEncryption.AWS_MANAGED,
-                    "removal_policy":cdk.RemovalPolicy.DESTROY
-                    # "read_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "write_capacity":5, # enabled if billing mode is PROVISIONED
-                    # "replication_regions":[],
-                },
-                "global_secondary_index": [
-                    {
-                        "partition_key":Attribute(
-                            name="organization",
-                            type=AttributeType.STRING
-                        ),
-                        # "read_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        # "write_capacity":5, # enabled if Table's billing mode is PROVISIONED
-                        "index_name":"organization",
-                        "projection_type":ProjectionType.ALL # Default
-                    }
-                ]
-            }
-        }
-
         # Apply table configurations
         self.dynamo_tables={}
 
-        for table, configuration in self.dynamodb_configurations.items():
+        for table, configuration in DYNAMODB_CONFIGURATIONS:
 
             # Create and set table configurations
             self.dynamo_tables[table]=Table(self, **configuration["table_configuration"])
@@ -190,41 +256,44 @@ class CdkDataStack(cdk.Stack):
                 for config in configuration["global_secondary_index"]:
                     self.dynamo_tables[table].add_global_secondary_index(**config)
 
+            # Target tracking on provisioned tables, for the table and each of its indexes
+            if configuration.get("auto_scaling"):
+                scaling = configuration["auto_scaling"]
+                capacity = {"min_capacity":scaling["min_capacity"], "max_capacity":scaling["max_capacity"]}
+                target = scaling["target_utilization_percent"]
+
+                self.dynamo_tables[table].auto_scale_read_capacity(**capacity).scale_on_utilization(target_utilization_percent=target)
+                self.dynamo_tables[table].auto_scale_write_capacity(**capacity).scale_on_utilization(target_utilization_percent=target)
+
+                for config in configuration["global_secondary_index"]:
+                    index_name = config["index_name"]
+                    self.dynamo_tables[table].auto_scale_global_secondary_index_read_capacity(index_name, **capacity).scale_on_utilization(target_utilization_percent=target)
+                    self.dynamo_tables[table].auto_scale_global_secondary_index_write_capacity(index_name, **capacity).scale_on_utilization(target_utilization_percent=target)
+
         ######################################
         #    Create & Configure S3 Buckets   #
         ######################################
 
+        # Ephemeral stage buckets are emptied & torn down with the stack, any other stage retains its documents
+        is_ephemeral = STAGE in EPHEMERAL_STAGES
+
         self.s3_buckets=Bucket(
             scope=self,
             id=f"{construct_id}-s3-bucket",
             bucket_name=f"{construct_id}-s3-bucket",
-            removal_policy=cdk.RemovalPolicy.DESTROY,
+            removal_policy=cdk.RemovalPolicy.DESTROY, # auto_delete_objects requires DESTROY on the L2 bucket
             auto_delete_objects=True,
             encryption=BucketEncryption.S3_MANAGED,
             enforce_ssl=True,
             # server_access_logs_prefix="bucket-access-logs",
             versioned=True,
-            cors=[
-                CorsRule(
-                    allowed_methods=[
-                        HttpMethods.GET,
-                        HttpMethods.POST
-                    ],
-                    allowed_origins=[
-                        "*"
-                    ],
-                    allowed_headers=[
-                        "x-amz-meta-upload-date",
-                        "x-amz-meta-document-name",
-                        "x-amz-meta-description",
-                        "x-amz-meta-attached-by",
-                        "Content-Type",
-                        "Authorization",
-                        "Date",
-                        "x-amz-content-sha256",
-                        "x-amz-date",
-                        "x-amz-security-token",
-                    ]
-                )
-            ]
-        )
\ No newline at end of file
+            cors=[CORS_RULE]
+        )
+
+        # Migration, retained buckets were first deployed with auto delete. Dropping its custom resource
+        # would run the delete handler & empty the bucket, so the bucket & the custom resource are both
+        # retained (never invoked on removal) for this release. auto_delete_objects can be turned off
+        # outside ephemeral stages in the next one
+        if not is_ephemeral:
+            self.s3_buckets.node.default_child.apply_removal_policy(cdk.RemovalPolicy.RETAIN)
+            self.s3_buckets.node.find_child("AutoDeleteObjectsCustomResource").apply_removal_policy(cdk.RemovalPolicy.RETAIN)
\ No newline at end of file
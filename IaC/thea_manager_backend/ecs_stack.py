@@ -6,13 +6,13 @@
 
 # Native Imports
 from os import getenv, path
-from dotenv import load_dotenv
 
 # CDK Imports - core
 from aws_cdk import core as cdk
 
 # CDK Imports - EC2
 from aws_cdk.aws_ec2 import (
+    Port,
     MachineImage,
     InstanceType,
     SubnetSelection
@@ -27,12 +27,10 @@ from aws_cdk.aws_iam import (
 # CDK Imports - elastic load balancer
 from aws_cdk.aws_elasticloadbalancingv2 import ApplicationLoadBalancer
 
-
 # CDK Imports - Log Groups
 from aws_cdk.aws_logs import LogGroup
 
 # CDK Imports - EKS & ECS Patterns
-from aws_cdk.aws_ecr import Repository
 from aws_cdk.aws_ecs_patterns import ApplicationLoadBalancedEc2Service
 from aws_cdk.aws_ecs import (
     Cluster,
@@ -41,14 +39,9 @@ from aws_cdk.aws_ecs import (
     NetworkMode, 
     PortMapping,
     ContainerImage,
-    Ec2TaskDefinition, 
-    AddCapacityOptions
+    Ec2TaskDefinition
 )
 
-
-# CDK Imports - Certificate Manager
-from aws_cdk.aws_certificatemanager import Certificate
-
 # ---------------------------------------------------------------
 #                           Globals
 # ---------------------------------------------------------------
@@ -56,11 +49,6 @@ from aws_cdk.aws_certificatemanager import Certificate
 # Current directoy
 current_directory = path.dirname(__file__)
 
-# Env vars
-load_dotenv(path.join(current_directory, "../.env"))
-DEDICATED=getenv("DEDICATED")
-ACCOUNT_NUMBER=getenv("ACCOUNT_NUMBER")
-
 # ---------------------------------------------------------------
 #                           Custom EC2 stack
 # ---------------------------------------------------------------
@@ -71,27 +59,40 @@ class CdkEcsStack(cdk.Stack):
     def __init__(self, scope: cdk.Construct, construct_id: str, vpc_stack, **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
 
+        # Env vars, already loaded by the app entrypoint
+        account_number = getenv("ACCOUNT_NUMBER")
+
         #######################################
         #         Configure ECS Cluster       #
         #######################################
 
         self.ecs_cluster = Cluster(
             scope=self,
-            id=f"thea-backend-{ACCOUNT_NUMBER}",
-            cluster_name=f"thea-backend-{ACCOUNT_NUMBER}",
-            vpc=vpc_stack.vpc,
-            capacity=AddCapacityOptions(
-                auto_scaling_group_name="thea-backend-server-asg",
-                min_capacity=1,
-                max_capacity=6,
-                desired_capacity=3,
-                vpc_subnets=SubnetSelection(subnet_group_name="app-tier"),
-                machine_image=MachineImage.generic_linux({
-                    "ca-central-1":"ami-0a2069a4a4d1a023e"
-                }),
-                instance_type=InstanceType(instance_type_identifier="t2.medium"),
-                can_containers_access_instance_role=True
-            )
+            id=f"thea-backend-{account_number}",
+            cluster_name=f"thea-backend-{account_number}",
+            vpc=vpc_stack.vpc
+        )
+
+        # Cluster capacity, same construct id the cluster's capacity option uses. Nothing scales the group
+        # (no scaling policy or capacity provider), so it is a fixed fleet of three instances
+        self.auto_scaling_group = self.ecs_cluster.add_capacity(
+            "DefaultAutoScalingGroup",
+            auto_scaling_group_name="thea-backend-server-asg",
+            min_capacity=3,
+            max_capacity=3,
+            vpc_subnets=SubnetSelection(subnet_group_name="app-tier"),
+            machine_image=MachineImage.generic_linux({
+                "ca-central-1":"ami-0a2069a4a4d1a023e"
+            }),
+            instance_type=InstanceType(instance_type_identifier="t3.medium"),
+            can_containers_access_instance_role=True,
+            allow_all_outbound=False
+        )
+
+        # Egress limited to HTTPS, S3 & DynamoDB traffic stays on the VPC's gateway endpoints
+        self.auto_scaling_group.connections.allow_to_any_ipv4(
+            Port.tcp(443),
+            "HTTPS to AWS APIs, ECR & the container registry"
         )
 
         #######################################
@@ -106,74 +107,51 @@ class CdkEcsStack(cdk.Stack):
         )
 
         # Add IAM roles to task definitions
-        self.task_definition.add_to_task_role_policy( # Deny statements with not actions
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "S3:PutObject",
-                    "S3:GetObject",
-                    "S3:HeadObject",
-                    "S3:DeleteObject",
-                    "S3:DeleteObjects",
-                    "S3:ListObjectsV2",
-                    "S3:ListObjectVersions",
-                    "SES:ListIdentities",
-                    "SES:ListEmailIdentities",
-                    "SES:VerifyEmailIdentity",
-                    "SES:SendTemplatedEmail",
-                    "SES:DeleteEmailIdentity",
-                    "SES:SendTemplatedEmail",
-                    "SES:DeleteIdentity",
-                    "dynamodb:Query",
-                    "dynamodb:PutItem",
-                    "dynamodb:GetItem",
-                    "dynamodb:UpdateItem",
-                    # "dynamodb:DeleteItem"
-                ]
-            )
-        )
-
         self.task_definition.add_to_task_role_policy( # Allow statements with actions
             PolicyStatement(
                 effect=Effect.ALLOW,
                 resources=["*"],
                 actions=[
-                    "S3:PutObject",
-                    "S3:GetObject",
-                    "S3:HeadObject",
-                    "S3:DeleteObject",
-                    "S3:DeleteObjects",
-                    "S3:ListObjectsV2",
-                    "S3:ListObjectVersions",
-                    "SES:ListIdentities",
-                    "SES:ListEmailIdentities",
-                    "SES:VerifyEmailIdentity",
-                    "SES:SendTemplatedEmail",
-                    "SES:DeleteEmailIdentity",
-                    "SES:SendTemplatedEmail",
-                    "SES:DeleteIdentity",
+                    # Presigned reads & uploads, listings & deletes on versioned buckets
+                    "s3:GetObject",
+                    "s3:GetObjectVersion",
+                    "s3:PutObject",
+                    "s3:DeleteObject",
+                    "s3:DeleteObjectVersion",
+                    "s3:ListBucket",
+                    "s3:ListBucketVersions",
+                    # Templated emails & sender identity management
+                    "ses:SendTemplatedEmail",
+                    "ses:ListIdentities",
+                    "ses:VerifyEmailIdentity",
+                    "ses:DeleteIdentity",
+                    "ses:DeleteVerifiedEmailAddress",
+                    # Users & organization tables
                     "dynamodb:Query",
+                    "dynamodb:Scan",
                     "dynamodb:PutItem",
                     "dynamodb:GetItem",
                     "dynamodb:UpdateItem",
-                    # "dynamodb:DeleteItem"
+                    "dynamodb:DeleteItem"
                 ]
             )
         )
 
+        # Server container log group
+        self.log_group = LogGroup(
+            scope=self,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            id="thea-backend-server-log-group",
+            log_group_name="thea-backend-server-log-group"
+        )
+
         # Add docker containers
         self.task_definition.add_container(
             id="thea-backend-server-ec2-container",
             memory_limit_mib=1024,
             logging=LogDriver.aws_logs(
                 stream_prefix="thea-backend-server-log-group",
-                log_group=LogGroup(
-                    scope=self,
-                    removal_policy=cdk.RemovalPolicy.DESTROY,
-                    id="thea-backend-server-log-group",
-                    log_group_name="thea-backend-server-log-group"
-                )
+                log_group=self.log_group
             ),
             user="thea-worker",
             # image=ContainerImage.from_asset(
@@ -207,19 +185,62 @@ class CdkEcsStack(cdk.Stack):
             vpc=vpc_stack.vpc,
             internet_facing=True,
             load_balancer_name=f"{construct_id}-alb",
-            vpc_subnets=SubnetSelection(subnet_group_name="alb-tier")
+            vpc_subnets=SubnetSelection(subnet_group_name="alb-tier"),
+            idle_timeout=cdk.Duration.seconds(300)
         )
 
+        # Desync mitigation is not exposed as a prop in this CDK version
+        self.alb.set_attribute("routing.http.desync_mitigation_mode", "defensive")
+
         #######################################
         #   Configure Load balanced service   #
         #######################################
 
         self.ecs_ec2_service = ApplicationLoadBalancedEc2Service(
             scope=self,
-            id=f"thea-backend-service-{ACCOUNT_NUMBER}",
-            service_name=f"thea-backend-service-{ACCOUNT_NUMBER}",
+            id=f"thea-backend-service-{account_number}",
+            service_name=f"thea-backend-service-{account_number}",
             cluster=self.ecs_cluster,
             task_definition=self.task_definition,
             load_balancer=self.alb,
-            public_load_balancer=True
-        )
\ No newline at end of file
+            public_load_balancer=True,
+            health_check_grace_period=cdk.Duration.seconds(60)
+        )
+
+        # Target health on the server's health check route, unhealthy tasks are pulled in ~20s
+        self.ecs_ec2_service.target_group.configure_health_check(
+            path="/",
+            interval=cdk.Duration.seconds(10),
+            timeout=cdk.Duration.seconds(5),
+            healthy_threshold_count=2,
+            unhealthy_threshold_count=2
+        )
+
+        # Drain deregistered tasks for 10s instead of the 300s default to speed up deploys
+        self.ecs_ec2_service.target_group.set_attribute("deregistration_delay.timeout_seconds", "10")
+
+        #######################################
+        #       Configure task autoscaling    #
+        #######################################
+
+        # Up to two awsvpc tasks per t3.medium (three ENIs) across the fixed three instance fleet,
+        # tasks past that would only sit PENDING
+        self.task_scaling = self.ecs_ec2_service.service.auto_scale_task_count(
+            min_capacity=1,
+            max_capacity=6
+        )
+
+        # Target tracking on ALB requests per task, between the old 500 scale in & 1000 scale out steps
+        self.task_scaling.scale_on_request_count(
+            "thea-backend-request-count-scaling",
+            requests_per_target=750,
+            target_group=self.ecs_ec2_service.target_group,
+            scale_out_cooldown=cdk.Duration.minutes(1),
+            scale_in_cooldown=cdk.Duration.minutes(5)
+        )
+
+        # Target tracking on CPU for sustained load
+        self.task_scaling.scale_on_cpu_utilization(
+            "thea-backend-cpu-scaling",
+            target_utilization_percent=60
+        )
@@ -39,6 +39,11 @@ load_dotenv(path.join(current_directory, "../.env"))
 STAGE=getenv("STAGE")
 ACCOUNT_NUMBER=getenv("ACCOUNT_NUMBER")
 
+# Failure alarm metric, API gateway 5XX errors for this api
+ALARM_METRIC_NAME = "5XXError"
+ALARM_DIMENSIONS = {"ApiName":"serverless-realtime-communication"}
+ALARM_PERIOD = cdk.Duration.minutes(1)
+
 # ---------------------------------------------------------------
 #                Serverless Realtime Communication
 # ---------------------------------------------------------------
@@ -84,22 +89,6 @@ class RealtimeCommunicationStack(cdk.Stack):
             alias_name="websocket-on-connect-alias",
         )
 
-        self.connect_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "apigateway:POST",
-                    "dynamodb:PutItem",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
         self.connect_handler.add_to_role_policy(
             PolicyStatement(
                 effect=Effect.ALLOW,
@@ -142,22 +131,6 @@ class RealtimeCommunicationStack(cdk.Stack):
             alias_name="websocket-on-disconnect-alias",
         )
 
-        self.disconnect_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "apigateway:POST",
-                    "dynamodb:DeleteItem",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
         self.disconnect_handler.add_to_role_policy(
             PolicyStatement(
                 effect=Effect.ALLOW,
@@ -227,22 +200,6 @@ class RealtimeCommunicationStack(cdk.Stack):
             alias_name="websocket-send-message",
         )
 
-        self.send_message_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "dynamodb:Scan",
-                    "dynamodb:PutItem",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
         self.send_message_handler.add_to_role_policy(
             PolicyStatement(
                 effect=Effect.ALLOW,
@@ -286,28 +243,13 @@ class RealtimeCommunicationStack(cdk.Stack):
             alias_name="websocket-discussions",
         )
 
-        self.discussions_handler.add_to_role_policy(
-            PolicyStatement(
-                effect=Effect.DENY,
-                resources=["*"],
-                not_actions=[
-                    "dynamodb:Scan",
-                    "dynamodb:PutItem",
-                    "ec2:CreateNetworkInterface",
-                    "ec2:DescribeNetworkInterfaces",
-                    "ec2:DeleteNetworkInterface",
-                    "ec2:AssignPrivateIpAddresses",
-                    "ec2:UnassignPrivateIpAddresses"
-                ]
-            )
-        )
-
         self.discussions_handler.add_to_role_policy(
             PolicyStatement(
                 effect=Effect.ALLOW,
                 resources=["*"],
                 actions=[
                     "dynamodb:Scan",
+                    "dynamodb:Query",
                     "dynamodb:PutItem"
                 ]
             )
@@ -347,27 +289,33 @@ class RealtimeCommunicationStack(cdk.Stack):
         #   create timed canary deployment   #
         ######################################
 
-        # Zipped alias name & function
-        zipped = [
+        # Alias name & alias pairs
+        aliases = (
             (f"{STAGE}-connect-alias", self.connect_alias),
             (f"{STAGE}-disconnect-alias", self.disconnect_alias),
             (f"{STAGE}-default-alias", self.default_alias),
             (f"{STAGE}-send-message-alias", self.send_message_alias),
-            (f"{STAGE}-discussions-alias", self.discussions_alias),
-        ]
+            (f"{STAGE}-discussions-alias", self.discussions_alias)
+        )
+
+        # Shared deployment settings
+        deployment_config = (
+            codedeploy.LambdaDeploymentConfig.CANARY_10_PERCENT_10_MINUTES if STAGE == "prod"
+            else codedeploy.LambdaDeploymentConfig.ALL_AT_ONCE
+        )
 
-        for name, alias in zipped:
+        for name, alias in aliases:
 
             # Alarm configuration 
             failure_alarm = cloudwatch.Alarm(
                 scope=self, 
                 id=name,
                 metric=cloudwatch.Metric(
-                    metric_name="5XXError",
+                    metric_name=ALARM_METRIC_NAME,
                     namespace=f"AWS/ApiGateway/RealtimeCommunication/{name}",
-                    dimensions={"ApiName": "serverless-realtime-communication"},
+                    dimensions=ALARM_DIMENSIONS,
                     statistic="Sum",
-                    period=cdk.Duration.minutes(1)),
+                    period=ALARM_PERIOD),
                 threshold=1,
                 evaluation_periods=1)
 
@@ -376,7 +324,7 @@ class RealtimeCommunicationStack(cdk.Stack):
                 scope=self,
                 id=f"{name}-DeploymentGroup",
                 alias=alias,
-                deployment_config=codedeploy.LambdaDeploymentConfig.CANARY_10_PERCENT_10_MINUTES,
+                deployment_config=deployment_config,
                 alarms=[failure_alarm])
 
 
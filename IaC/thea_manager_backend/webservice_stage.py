@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 from aws_cdk import core as cdk
 
 # local stack imports
+from thea_manager_backend.vpc_stack import CdkVpcStack
 from thea_manager_backend.authentication_stack import AuthenticationStack
 from thea_manager_backend.realtime_communication_stack import RealtimeCommunicationStack
 
@@ -34,11 +35,15 @@ class RTCWebServiceStage(cdk.Stage):
   def __init__(self, scope: cdk.Construct, id: str, **kwargs):
     super().__init__(scope, id, **kwargs)
 
-    # Authentication webservice
-    rtc_service = RealtimeCommunicationStack(self, id)
+    # Realtime handlers run inside a VPC, deployed as part of the stage
+    vpc_service = CdkVpcStack(self, f"{id}-vpc")
+
+    # Realtime communication webservice
+    rtc_service = RealtimeCommunicationStack(self, id, vpc_service)
+    rtc_service.add_dependency(vpc_service)
 
     # Retrieve url output
-    self.api_endpoint = rtc_service.api_endpoint
+    self.api_endpoint = rtc_service.websocket_api_gateway.api_endpoint
     
 class AuthenticationWebServiceStage(cdk.Stage):
   def __init__(self, scope: cdk.Construct, id: str, **kwargs):
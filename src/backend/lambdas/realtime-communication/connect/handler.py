@@ -4,6 +4,7 @@
 
 import json
 from os import getenv
+from time import time
 from boto3 import resource
 
 # ---------------------------------------------------------------
@@ -12,6 +13,9 @@ from boto3 import resource
 
 CUSTOMER_ID = getenv("CUSTOMER_ID")
 
+# API Gateway closes websocket connections after 2 hours, stale rows expire past that
+CONNECTION_TTL_SECONDS = 2 * 60 * 60
+
 # ---------------------------------------------------------------
 #                         Dynamo Utils
 # ---------------------------------------------------------------
@@ -48,6 +52,7 @@ def handler(event, context):
     json_obj = {}
     json_obj["itemId"] = event["queryStringParameters"]["itemId"]
     json_obj["connectionId"] = event["requestContext"]["connectionId"]
+    json_obj["ttl"] = int(time()) + CONNECTION_TTL_SECONDS
 
     # Push to DynamoDB
     message, http_status_code = write(json_obj)
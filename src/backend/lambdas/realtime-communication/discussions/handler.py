@@ -6,15 +6,15 @@
 import json
 import logging
 
-from re import sub
 from time import time
 from os import getenv
 from uuid import uuid4
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 
 # Boto3 Imports
-from boto3 import client, resource
-from boto3.dynamodb.conditions import Key, And
+from boto3 import client
+from botocore.config import Config
+from boto3.dynamodb.types import TypeSerializer
 
 # ---------------------------------------------------------------
 #                            Globals
@@ -23,15 +23,35 @@ from boto3.dynamodb.conditions import Key, And
 CUSTOMER_ID = getenv("CUSTOMER_ID")
 WEBSOCKET_ENDPOINT = getenv("WEBSOCKET_ENDPOINT")
 
+# Global secondary indexes per table, keyed by their partition key
+TABLE_INDEXES = {f"OnlineConnection-{CUSTOMER_ID}": {"itemId": "itemId"}}
+
+# Websocket fan-out workers, one pooled connection each
+FAN_OUT_WORKERS = 32
+
 # ---------------------------------------------------------------
 #                           Configs
 # ---------------------------------------------------------------
 
-db = resource("dynamodb")
-websock_client = client("apigatewaymanagementapi", endpoint_url=WEBSOCKET_ENDPOINT)
+# Keeps warm connections alive across invocations & caps retry tail latency
+client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=FAN_OUT_WORKERS,
+    retries={"mode": "standard", "max_attempts": 2},
+)
+
+# Low level client, items & filter values are marshalled to attribute values by the serializer
+db = client("dynamodb", config=client_config)
+serializer = TypeSerializer()
+websock_client = client(
+    "apigatewaymanagementapi", endpoint_url=WEBSOCKET_ENDPOINT, config=client_config
+)
 
 logger = logging.getLogger(__name__)
 
+# Websocket fan-out workers, reused across warm invocations
+pool = ThreadPoolExecutor(max_workers=FAN_OUT_WORKERS)
+
 # ---------------------------------------------------------------
 #                           DynamoDB
 # ---------------------------------------------------------------
@@ -40,11 +60,11 @@ logger = logging.getLogger(__name__)
 # Write to dynamodb
 def write(item: dict):
 
-    # Connect to datatable
-    table = db.Table(f"Discussions-{CUSTOMER_ID}")
-
-    # write to dynamo
-    response = table.put_item(Item=item)
+    # write to dynamo, non string fields (numbers, None, ...) keep their type
+    response = db.put_item(
+        TableName=f"Discussions-{CUSTOMER_ID}",
+        Item={key: serializer.serialize(value) for key, value in item.items()},
+    )
 
     status_code = response["ResponseMetadata"]["HTTPStatusCode"]
 
@@ -88,13 +108,13 @@ def read_multiple_items(
 
         - limit:
             type: int [optional]
-            description: how many keys to return durnig query
+            description: how many keys to read per query page, every page is returned
 
     Returns:
 
         - response:
             type: str or list
-            description: server response data
+            description: server response data, items as DynamoDB attribute values
 
         - http_staus_code:
             type: int
@@ -102,21 +122,65 @@ def read_multiple_items(
     """
 
     # Target DynamoDB table
-    response = db.Table(table_name).scan(
-        ProjectionExpression=projection_expression,
-        FilterExpression=reduce(And, ([Key(k).eq(v) for k, v in filters.items()])),
-    )
-
-    if "Items" in response.keys():
-        logger.info(
-            f"{response['Items']} - response['ResponseMetadata']['HTTPStatusCode']"
-        )
-        return response["Items"], response["ResponseMetadata"]["HTTPStatusCode"]
+    indexes = TABLE_INDEXES.get(table_name, {})
+
+    # Equality condition & attribute values per filter
+    names = {f"#k{i}": key for i, key in enumerate(filters)}
+    values = {f":v{i}": serializer.serialize(value) for i, value in enumerate(filters.values())}
+    condition = " AND ".join(f"#k{i} = :v{i}" for i in range(len(filters)))
+
+    # Single key lookups on an indexed attribute only read the matching rows
+    if len(filters) == 1 and next(iter(filters)) in indexes:
+        read = db.query
+        request = {
+            "TableName": table_name,
+            "IndexName": indexes[next(iter(filters))],
+            "KeyConditionExpression": condition,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+            "ProjectionExpression": projection_expression,
+            "Limit": limit,
+        }
+
+    # Fallback, full table scan filtered after the read
     else:
-        logger.error(
-            f"Empty results - {response['ResponseMetadata']['HTTPStatusCode']}"
-        )
-        return None, response["ResponseMetadata"]["HTTPStatusCode"]
+        read = db.scan
+        request = {
+            "TableName": table_name,
+            "ProjectionExpression": projection_expression,
+            "FilterExpression": condition,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+        }
+
+    if last_evaluated_key:
+        request["ExclusiveStartKey"] = last_evaluated_key
+
+    # Follow LastEvaluatedKey so matches past the first page (limit or 1MB) are returned too
+    items = []
+    while True:
+        response = read(**request)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    logger.info(f"{len(items)} items - {response['ResponseMetadata']['HTTPStatusCode']}")
+    return items, response["ResponseMetadata"]["HTTPStatusCode"]
+
+
+# ---------------------------------------------------------------
+#                           Websocket
+# ---------------------------------------------------------------
+
+
+# Post to a single connection, a closed connection does not abort the fan-out
+def post(connection_id: str, payload: str):
+
+    try:
+        websock_client.post_to_connection(ConnectionId=connection_id, Data=payload)
+    except websock_client.exceptions.GoneException:
+        logger.info(f"Stale connection - {connection_id}")
 
 
 # ---------------------------------------------------------------
@@ -142,15 +206,9 @@ def lambda_handler(event, context):
     # Add timestamp to request body
     request_body["timestamp"] = timestamp
 
-    # Send message to websocket channel
-    for token in connection_ids:
-        websock_client.post_to_connection(
-            ConnectionId=token["connectionId"], Data=json.dumps(request_body)
-        )
-
-    # Write to db
+    # Write to db, persisted on the pool while the fan-out runs
     item = {
-        "messageId": sub("-", "", str(uuid4())),
+        "messageId": uuid4().hex,
         "timestamp": request_body["timestamp"],
         "customerId": request_body["customerId"],
         "projectId": request_body["projectId"],
@@ -158,7 +216,19 @@ def lambda_handler(event, context):
         "sender": request_body["sender"],
         "itemId": request_body["itemId"],
     }
-    write(item)
+    persisted = pool.submit(write, item)
+
+    # Send message to websocket channel, serialized once & posted concurrently
+    payload = json.dumps(request_body)
+    list(
+        pool.map(
+            lambda token: post(token["connectionId"]["S"], payload),
+            connection_ids or [],
+        )
+    )
+
+    # Wait on the write before returning, surfaces its errors
+    persisted.result()
 
     # TODO implement
     return {"statusCode": 200, "body": json.dumps(request_body)}
@@ -6,14 +6,14 @@
 from boto3 import client
 
 # Utils Imports
-from ..utils import exception_handler
+from ..utils import exception_handler, CLIENT_CONFIG
 
 # ---------------------------------------------------------------
 #                           Cognito Utils
 # ---------------------------------------------------------------
 
 # Declare boto3 cognito client
-cognito = client("cognito-idp")
+cognito = client("cognito-idp", config=CLIENT_CONFIG)
 
 
 # Change password
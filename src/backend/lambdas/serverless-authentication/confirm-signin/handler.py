@@ -10,14 +10,14 @@ from boto3 import client, resource
 from botocore.exceptions import ClientError, WaiterError, ParamValidationError
 
 # Utils imports
-from ..utils import exception_handler, compute_secret_hash
+from ..utils import exception_handler, compute_secret_hash, CLIENT_CONFIG
 
 # ---------------------------------------------------------------
 #                  Cognito Utils
 # ---------------------------------------------------------------
 
 # Declare boto3 cognito client
-cognito = client("cognito-idp")
+cognito = client("cognito-idp", config=CLIENT_CONFIG)
 
 
 # Intiate signin
@@ -239,7 +239,7 @@ def get_user_details(access_token: str):
 # ---------------------------------------------------------------
 
 # Declare boto3 dynamodb client
-dynamodb = resource("dynamodb")
+dynamodb = resource("dynamodb", config=CLIENT_CONFIG)
 
 
 def create_item(table_name: str, item: dict):
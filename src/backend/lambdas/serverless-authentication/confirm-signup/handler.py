@@ -11,14 +11,14 @@ from boto3 import client, resource
 from botocore.exceptions import ClientError, WaiterError, ParamValidationError
 
 # Utils imports
-from ..utils import exception_handler, compute_secret_hash
+from ..utils import exception_handler, compute_secret_hash, CLIENT_CONFIG
 
 # ---------------------------------------------------------------
 #                            Cognito Utils
 # ---------------------------------------------------------------
 
 # Declare boto3 cognito client
-cognito = client("cognito-idp")
+cognito = client("cognito-idp", config=CLIENT_CONFIG)
 
 
 # Confirm signup
@@ -74,7 +74,7 @@ def confirm_signup(
 # ---------------------------------------------------------------
 
 # Declare boto3 dynamodb client
-dynamodb = resource("dynamodb")
+dynamodb = resource("dynamodb", config=CLIENT_CONFIG)
 
 
 # Write data to dynamodb table
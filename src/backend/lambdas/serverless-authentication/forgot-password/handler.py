@@ -6,14 +6,14 @@
 from boto3 import client
 
 # Utils imports
-from ..utils import exception_handler, compute_secret_hash
+from ..utils import exception_handler, compute_secret_hash, CLIENT_CONFIG
 
 # ---------------------------------------------------------------
 #                           Utils
 # ---------------------------------------------------------------
 
 # Declare boto3 cognito client
-cognito = client("cognito-idp")
+cognito = client("cognito-idp", config=CLIENT_CONFIG)
 
 
 # Intiate password reset
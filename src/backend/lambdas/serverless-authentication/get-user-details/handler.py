@@ -9,14 +9,14 @@ from re import sub
 from boto3 import client, resource
 
 # Utils Imports
-from ..utils import exception_handler
+from ..utils import exception_handler, CLIENT_CONFIG
 
 # ---------------------------------------------------------------
 #                  Cognito Utils
 # ---------------------------------------------------------------
 
 # Declare boto3 cognito client
-cognito = client("cognito-idp")
+cognito = client("cognito-idp", config=CLIENT_CONFIG)
 
 
 # Get user details
@@ -78,7 +78,7 @@ def get_user_details_cognito(access_token: str):
 # ---------------------------------------------------------------
 
 # Declare dynamodb client
-dynamodb = resource("dynamodb")
+dynamodb = resource("dynamodb", config=CLIENT_CONFIG)
 
 
 # Retrieve
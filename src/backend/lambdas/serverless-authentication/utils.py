@@ -11,12 +11,18 @@ from hmac import new
 from hashlib import sha256
 from base64 import b64encode
 
+# Boto3 imports
+from botocore.config import Config
+
 # ---------------------------------------------------------------
 #                            Globals
 # ---------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
 
+# Shared boto3 client config, keeps warm connections alive & caps retry tail latency
+CLIENT_CONFIG = Config(tcp_keepalive=True, retries={"mode": "standard", "max_attempts": 2})
+
 # ---------------------------------------------------------------
 #                            Utils
 # ---------------------------------------------------------------